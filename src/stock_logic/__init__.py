@@ -12,6 +12,7 @@ from .data_processing import DataProcessor
 from .model_operations import ModelOperations
 from .performance_eval import PerformanceEvaluator
 from .training_workflow import TrainingWorkflow
+from .prediction_monitor import PredictionMonitor
 from .app_interface import AppInterface
 
 # Variabel __all__ mendefinisikan 'public API' dari paket ini.
@@ -24,6 +25,7 @@ __all__ = [
     'ModelOperations',
     'PerformanceEvaluator',
     'TrainingWorkflow',
+    'PredictionMonitor',
     'AppInterface'
 ]
 
@@ -1,9 +1,13 @@
+import datetime
 import gradio as gr
 import numpy as np
+from . import config
 from .model_operations import ModelOperations
+from .prediction_monitor import PredictionMonitor
+from .training_workflow import TrainingWorkflow
 
 class AppInterface:
-    def __init__(self, model_file_path, ui_input_cols_ordered):
+    def __init__(self, model_file_path, ui_input_cols_ordered, ticker=config.DEFAULT_TICKER, enable_monitoring=True):
         """
         Inisialisasi (constructor) untuk antarmuka aplikasi Gradio.
         Fungsi ini memuat model prediksi yang sudah dilatih dari file dan menyiapkan
@@ -12,13 +16,19 @@ class AppInterface:
         Args:
             model_file_path (str): Path ke file model .joblib yang telah disimpan.
             ui_input_cols_ordered (list): Daftar nama kolom fitur sesuai urutan yang akan ditampilkan di UI.
+            ticker (str, optional): Kode saham yang dilayani model ini. Defaults to config.DEFAULT_TICKER.
+            enable_monitoring (bool, optional): Aktifkan monitoring akurasi dan drift. Defaults to True.
         """
         self.model_file_path = model_file_path
         self.ui_input_cols_ordered = ui_input_cols_ordered
+        self.ticker = ticker
+        self.monitor = None
         
         try:
-            # Memuat artifak model dan urutan fitur yang digunakan saat training
-            self.pred_model, self.trained_model_feature_order = ModelOperations.load_prediction_model(self.model_file_path)
+            # Memuat artifak model, urutan fitur, dan statistik acuan yang disimpan saat training
+            model_payload = ModelOperations.load_model_payload(self.model_file_path)
+            self.pred_model = model_payload['model_artifact']
+            self.trained_model_feature_order = model_payload['feature_columns_used']
             
             if not self.trained_model_feature_order:
                 raise ValueError("Daftar fitur (feature_columns_used) tidak ditemukan dalam model yang dimuat.")
@@ -34,6 +44,44 @@ class AppInterface:
         except Exception as e:
             raise RuntimeError(f"Error saat memuat model untuk UI: {e}")
 
+        if enable_monitoring:
+            # Monitor mencatat setiap prediksi dan membandingkannya dengan harga aktual hari berikutnya
+            self.monitor = PredictionMonitor(
+                feature_names=self.trained_model_feature_order,
+                target_col_label=config.TARGET_COLUMN_NAME,
+                log_dir=config.MONITOR_OUTPUT_SUBDIR,
+                reference_feature_stats=model_payload['reference_feature_stats'],
+                reference_mse=model_payload['reference_mse'],
+                window_size=config.MONITOR_WINDOW_SIZE,
+                min_samples=config.MONITOR_MIN_SAMPLES,
+                mse_ratio_threshold=config.MONITOR_MSE_RATIO_THRESHOLD,
+                drift_threshold=config.MONITOR_DRIFT_THRESHOLD,
+                retrain_cooldown_seconds=config.MONITOR_RETRAIN_COOLDOWN_SECONDS,
+                retrain_fn=self._retrain_model,
+                exchange_holidays=config.MONITOR_EXCHANGE_HOLIDAYS
+            )
+
+    def _retrain_model(self, ticker):
+        """
+        Melatih ulang model dengan dataset ditambah pasangan prediksi-aktual dari log monitoring,
+        lalu memuat ulang artifaknya. Dipanggil oleh PredictionMonitor di thread terpisah saat
+        ambang akurasi atau drift terlampaui.
+
+        Args:
+            ticker (str): Kode saham yang perlu di-retrain.
+        """
+        row_dates, X_joined, y_joined = self.monitor.get_joined_training_rows(ticker)
+        # Kolom log mengikuti urutan fitur model, sedangkan training mengikuti FEATURE_COLUMN_NAMES
+        column_order = [self.monitor.feature_names.index(col) for col in config.FEATURE_COLUMN_NAMES]
+
+        workflow = TrainingWorkflow(app_settings=config, model_save_path=self.model_file_path)
+        workflow.execute(extra_training_rows=(row_dates, X_joined[:, column_order], y_joined), create_plot=False)
+
+        model_payload = ModelOperations.load_model_payload(workflow.model_save_path)
+        self.pred_model = model_payload['model_artifact']
+        self.trained_model_feature_order = model_payload['feature_columns_used']
+        self.monitor.set_reference(model_payload['reference_feature_stats'], model_payload['reference_mse'])
+
     def _predict_price(self, *input_values):
         """
         Fungsi inti yang melakukan prediksi berdasarkan input dari pengguna di UI Gradio.
@@ -41,10 +89,21 @@ class AppInterface:
 
         Args:
             *input_values: Nilai-nilai input dari komponen UI Gradio, diterima sebagai tuple.
+                           Jika monitoring aktif, nilai pertama adalah tanggal bar (YYYY-MM-DD).
 
         Returns:
             str: String yang diformat berisi hasil prediksi atau pesan error.
         """
+        bar_date = None
+        if self.monitor is not None:
+            if not input_values:
+                return "Error: Tanggal hari ini harus diisi."
+            bar_date_text, input_values = input_values[0], input_values[1:]
+            try:
+                bar_date = datetime.date.fromisoformat(str(bar_date_text).strip())
+            except ValueError:
+                return "Error: Format tanggal harus YYYY-MM-DD."
+
         if len(input_values) != len(self.ui_input_cols_ordered):
             return f"Error: Jumlah input ({len(input_values)}) tidak cocok ({len(self.ui_input_cols_ordered)} fitur diharapkan)."
         
@@ -57,8 +116,7 @@ class AppInterface:
             
             # Melakukan prediksi
             predicted_value = self.pred_model.predict(model_input_array)
-            # Mengembalikan hasil prediksi dalam format string yang rapi
-            return f"Prediksi Harga Penutupan Besok: {predicted_value[0]:.2f}"
+            result_text = f"Prediksi Harga Penutupan Besok: {predicted_value[0]:.2f}"
         except ValueError:
             return "Error: Pastikan semua input adalah angka."
         except KeyError as e:
@@ -66,6 +124,23 @@ class AppInterface:
         except Exception as e:
             return f"Error saat prediksi: {str(e)}"
 
+        # Monitoring dijalankan terpisah agar kegagalannya tidak menggagalkan prediksi yang sudah valid
+        if self.monitor is not None:
+            try:
+                # Submit terakhir per tanggal menjadi bar hari itu; harga penutupannya digabung
+                # sebagai aktual untuk prediksi hari bursa sebelumnya saat tanggal berikutnya masuk
+                self.monitor.record_prediction(model_input_array[0].tolist(), float(predicted_value[0]), bar_date, self.ticker)
+                summary = self.monitor.get_summary(self.ticker)
+                if summary['n_samples'] > 0:
+                    result_text += (f"\nMSE Bergulir: {summary['rolling_mse']:.4f} | "
+                                    f"MAE Bergulir: {summary['rolling_mae']:.4f} "
+                                    f"({summary['n_samples']} sampel)")
+            except Exception as e:
+                print(f"[Peringatan Monitor] Gagal memperbarui monitoring: {e}")
+
+        # Mengembalikan hasil prediksi dalam format string yang rapi
+        return result_text
+
     def launch(self):
         """
         Membangun komponen-komponen UI Gradio dan meluncurkan server webnya.
@@ -74,6 +149,9 @@ class AppInterface:
         gradio_input_components = [
             gr.Number(label=f"{col_label} Hari Ini") for col_label in self.ui_input_cols_ordered
         ]
+        # Tanggal bar hanya dibutuhkan monitoring untuk menggabungkan prediksi dengan aktualnya
+        if self.monitor is not None:
+            gradio_input_components.insert(0, gr.Textbox(label="Tanggal Hari Ini (YYYY-MM-DD)"))
         
         # Membuat objek antarmuka Gradio
         ui = gr.Interface(
@@ -87,5 +165,10 @@ class AppInterface:
             theme=gr.themes.Soft()            # Menggunakan tema visual 'Soft'
         )
         print("[log] Meluncurkan antarmuka Gradio... Akses melalui browser Anda.")
-        # Meluncurkan aplikasi web, share=True untuk membuat link publik
-        ui.launch(share=True)
\ No newline at end of file
+        try:
+            # Meluncurkan aplikasi web, share=True untuk membuat link publik
+            ui.launch(share=True)
+        finally:
+            # Menutup file log monitoring saat server berhenti, termasuk jika peluncuran gagal
+            if self.monitor is not None:
+                self.monitor.close()
\ No newline at end of file
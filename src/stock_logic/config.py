@@ -17,6 +17,7 @@ OUTPUT_PARENT_DIR = os.path.join(PROJECT_ROOT, '../outputs')
 # Mendefinisikan path untuk sub-direktori di dalam 'outputs'.
 MODEL_OUTPUT_SUBDIR = os.path.join(OUTPUT_PARENT_DIR, '../outputs/models') # Untuk menyimpan file model
 PLOT_OUTPUT_SUBDIR = os.path.join(OUTPUT_PARENT_DIR, '../outputs/plots')   # Untuk menyimpan file gambar/plot
+MONITOR_OUTPUT_SUBDIR = os.path.join(OUTPUT_PARENT_DIR, '../outputs/monitoring') # Untuk log prediksi yang dilayani
 
 # === PEMBUATAN DIREKTORI OTOMATIS ===
 # Blok kode ini memeriksa apakah direktori yang dibutuhkan sudah ada.
@@ -34,6 +35,9 @@ if not os.path.exists(MODEL_OUTPUT_SUBDIR):
 if not os.path.exists(PLOT_OUTPUT_SUBDIR):
     os.makedirs(PLOT_OUTPUT_SUBDIR)
 
+if not os.path.exists(MONITOR_OUTPUT_SUBDIR):
+    os.makedirs(MONITOR_OUTPUT_SUBDIR)
+
 # === PENGATURAN PATH FILE ===
 # Path lengkap ke file dataset CSV.
 CSV_FILE_PATH = os.path.join(DATA_DIR, 'Dataset Saham.csv') 
@@ -65,3 +69,22 @@ XGBOOST_PARAMS = {
     'verbosity': 0,            # Level output log (0 = silent).
     'random_state': 42         # Seed untuk reproduktifitas hasil.
 }
+
+
+# === KONFIGURASI MONITORING PREDIKSI ===
+# Nama ticker default untuk model yang dilayani (dataset saat ini hanya berisi satu saham).
+DEFAULT_TICKER = 'SAHAM'
+# Jumlah pasangan prediksi-aktual terakhir yang dipakai untuk MSE/MAE bergulir dan statistik drift.
+MONITOR_WINDOW_SIZE = 30
+# Jumlah sampel minimum di jendela sebelum ambang batas mulai diperiksa.
+MONITOR_MIN_SAMPLES = 10
+# Retrain dipicu jika MSE bergulir > rasio ini dikali MSE data uji saat training.
+MONITOR_MSE_RATIO_THRESHOLD = 2.0
+# Retrain dipicu jika rata-rata bergulir suatu fitur bergeser lebih dari N standar deviasi data training.
+MONITOR_DRIFT_THRESHOLD = 3.0
+# Jeda minimum (detik) antar retrain untuk ticker yang sama.
+MONITOR_RETRAIN_COOLDOWN_SECONDS = 3600
+# Tanggal libur bursa (format 'YYYY-MM-DD') di luar Sabtu/Minggu. Target model adalah baris
+# berikutnya di dataset (hari bursa berikutnya), jadi daftar ini harus diisi sesuai kalender bursa
+# agar bar setelah hari libur tetap digabung sebagai aktual untuk prediksi sebelum libur.
+MONITOR_EXCHANGE_HOLIDAYS = []
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd 
 from sklearn.model_selection import TimeSeriesSplit 
 
@@ -91,6 +92,34 @@ class DataProcessor:
         if self.X_prepared.size == 0 or self.y_prepared.size == 0:
             raise ValueError("X_prepared atau y_prepared kosong setelah persiapan. Periksa data Anda.")
 
+    def append_training_rows(self, row_dates, X_extra, y_extra):
+        """
+        Menambahkan baris training baru (misal pasangan prediksi-aktual dari monitoring) ke akhir
+        data yang sudah dipersiapkan. Hanya baris yang tanggalnya setelah data terakhir di dataset
+        yang dipakai, agar tidak menduplikasi data historis dan urutan waktu tetap terjaga.
+
+        Args:
+            row_dates (list): Tanggal bar (hari H) untuk setiap baris.
+            X_extra (np.array): Data fitur pada hari H, urut sesuai `feature_col_labels`.
+            y_extra (np.array): Harga penutupan aktual pada hari H+1.
+        """
+        if self.X_prepared is None or self.y_prepared is None:
+            raise ValueError("Data belum dipersiapkan. Panggil prepare_for_training() dulu.")
+        if len(row_dates) == 0:
+            return
+        if X_extra.shape[1] != self.X_prepared.shape[1]:
+            raise ValueError(f"Jumlah fitur baris tambahan ({X_extra.shape[1]}) tidak cocok dengan dataset ({self.X_prepared.shape[1]}).")
+
+        last_dataset_date = self.df_raw.index.max()
+        is_new_row = np.array([pd.Timestamp(row_date) > last_dataset_date for row_date in row_dates])
+        if not is_new_row.any():
+            print("[log] Tidak ada baris training tambahan yang lebih baru dari dataset.")
+            return
+
+        self.X_prepared = np.vstack([self.X_prepared, X_extra[is_new_row]])
+        self.y_prepared = np.concatenate([self.y_prepared, y_extra[is_new_row]])
+        print(f"[log] {int(is_new_row.sum())} baris training tambahan ditambahkan. Bentuk X: {self.X_prepared.shape}")
+
     def split_time_series_data(self):
         """
         Membagi data menjadi set training dan testing menggunakan TimeSeriesSplit.
@@ -1,3 +1,4 @@
+import os
 import joblib 
 from .ml_models import build_model 
 
@@ -54,7 +55,8 @@ class ModelOperations:
         # Menggunakan model yang sudah dilatih untuk memprediksi data input
         return self.trained_model.predict(X_input_data)
 
-    def save_trained_model(self, output_path, training_feature_cols, training_target_col):
+    def save_trained_model(self, output_path, training_feature_cols, training_target_col,
+                           reference_feature_stats=None, reference_mse=None):
         """
         Menyimpan model yang telah dilatih beserta metadatanya ke sebuah file.
         Metadata penting seperti daftar fitur yang digunakan juga disimpan agar konsisten saat prediksi.
@@ -63,6 +65,9 @@ class ModelOperations:
             output_path (str): Path file untuk menyimpan model (misal, 'model.joblib').
             training_feature_cols (list): Daftar nama kolom fitur yang digunakan saat training.
             training_target_col (str): Nama kolom target yang digunakan saat training.
+            reference_feature_stats (dict, optional): Rata-rata dan standar deviasi tiap fitur pada
+                                                      data training, dipakai untuk deteksi drift.
+            reference_mse (float, optional): MSE pada data uji, dipakai sebagai acuan monitoring.
         """
         if self.trained_model is None:
             raise ValueError("Tidak ada model untuk disimpan (model belum dilatih).")
@@ -73,34 +78,55 @@ class ModelOperations:
             'architecture': self.model_architecture,
             'hyperparameters': self.model_hyperparams,
             'feature_columns_used': training_feature_cols, 
-            'target_column_used': training_target_col
+            'target_column_used': training_target_col,
+            'reference_feature_stats': reference_feature_stats,
+            'reference_mse': reference_mse
         }
-        # Menggunakan joblib untuk menyimpan payload ke file
-        joblib.dump(persistence_payload, output_path)
+        # Menyimpan ke file sementara lalu mengganti file lama secara atomik,
+        # agar aplikasi yang sedang berjalan tidak pernah membaca file model yang setengah tertulis
+        temp_output_path = f"{output_path}.tmp"
+        joblib.dump(persistence_payload, temp_output_path)
+        os.replace(temp_output_path, output_path)
         print(f"[log] Model dan metadata disimpan ke {output_path}")
 
     @staticmethod
-    def load_prediction_model(model_file_path):
+    def load_model_payload(model_file_path):
         """
-        Memuat model dan metadata dari file yang telah disimpan.
-        Ini adalah 'staticmethod' karena bisa dipanggil tanpa harus membuat instance dari kelas ModelOperations.
+        Memuat seluruh payload model (artifak dan metadata) dari file dengan satu kali deserialisasi.
+        Dipakai jika metadata tambahan, seperti statistik acuan untuk monitoring, juga dibutuhkan.
+        Model lama yang disimpan sebelum statistik acuan ada akan berisi None untuk kunci tersebut.
 
         Args:
             model_file_path (str): Path ke file model yang akan dimuat.
 
         Returns:
-            tuple: Berisi (objek model, daftar fitur yang digunakan saat training).
+            dict: Payload berisi 'model_artifact', 'feature_columns_used', 'reference_feature_stats',
+                  'reference_mse', dan metadata lainnya.
         """
         print(f"[log] Memuat model dan metadata dari {model_file_path}...")
         # Memuat payload dari file joblib
         loaded_payload = joblib.load(model_file_path)
         
-        # Mengekstrak objek model dan daftar fitur dari payload
-        model_artifact = loaded_payload.get('model_artifact')
-        feature_cols_used = loaded_payload.get('feature_columns_used')
-        
-        if model_artifact is None or feature_cols_used is None:
+        # Memastikan objek model dan daftar fitur ada di payload
+        if loaded_payload.get('model_artifact') is None or loaded_payload.get('feature_columns_used') is None:
             raise ValueError("File model korup atau kehilangan data esensial (model_artifact, feature_columns_used).")
+        loaded_payload.setdefault('reference_feature_stats', None)
+        loaded_payload.setdefault('reference_mse', None)
             
         print("[log] Model dan metadata berhasil dimuat.")
-        return model_artifact, feature_cols_used
\ No newline at end of file
+        return loaded_payload
+
+    @staticmethod
+    def load_prediction_model(model_file_path):
+        """
+        Memuat model dan metadata dari file yang telah disimpan.
+        Ini adalah 'staticmethod' karena bisa dipanggil tanpa harus membuat instance dari kelas ModelOperations.
+
+        Args:
+            model_file_path (str): Path ke file model yang akan dimuat.
+
+        Returns:
+            tuple: Berisi (objek model, daftar fitur yang digunakan saat training).
+        """
+        loaded_payload = ModelOperations.load_model_payload(model_file_path)
+        return loaded_payload['model_artifact'], loaded_payload['feature_columns_used']
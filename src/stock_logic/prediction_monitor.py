@@ -0,0 +1,454 @@
+import datetime
+import os
+import struct
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# Format satu record di log biner (little-endian, ukuran tetap):
+# jenis record (1 byte), timestamp, tanggal bar (ordinal), nilai prediksi, nilai aktual,
+# lalu nilai tiap fitur (float64).
+# Jenis b'P' = prediksi yang dilayani (aktual = NaN), b'J' = prediksi yang sudah digabung dengan aktual.
+RECORD_KIND_PREDICTION = b'P'
+RECORD_KIND_JOINED = b'J'
+# Jumlah record terakhir (kelipatan window_size) yang dibaca dari log saat monitor dibuat ulang.
+RESTORE_TAIL_FACTOR = 20
+
+
+def _record_struct(n_features):
+    """
+    Membuat objek `struct.Struct` untuk record log dengan jumlah fitur tertentu.
+
+    Args:
+        n_features (int): Jumlah fitur yang disimpan per record.
+
+    Returns:
+        struct.Struct: Struktur biner untuk pack/unpack record.
+    """
+    return struct.Struct('<cdqdd' + 'd' * n_features)
+
+
+def is_next_trading_day(previous_date, next_date, holidays=None):
+    """
+    Memeriksa apakah `next_date` adalah hari bursa tepat setelah `previous_date`.
+    Hari bursa adalah Senin-Jumat di luar tanggal libur bursa yang diberikan.
+
+    Args:
+        previous_date (datetime.date): Tanggal bar sebelumnya.
+        next_date (datetime.date): Tanggal bar baru.
+        holidays (list, optional): Daftar tanggal libur bursa.
+
+    Returns:
+        bool: True jika tidak ada hari bursa yang terlewat di antara keduanya.
+    """
+    holiday_dates = np.array(holidays if holidays is not None else [], dtype='datetime64[D]')
+    busday_gap = np.busday_count(np.datetime64(previous_date, 'D'), np.datetime64(next_date, 'D'), holidays=holiday_dates)
+    return int(busday_gap) == 1
+
+
+class _RollingWindow:
+    def __init__(self, window_size, n_features):
+        """
+        Jendela bergulir berukuran tetap yang menyimpan jumlah berjalan (running sum)
+        sehingga setiap pembaruan hanya membutuhkan O(1) terhadap panjang riwayat.
+
+        Args:
+            window_size (int): Jumlah sampel terakhir yang disimpan.
+            n_features (int): Jumlah fitur per sampel.
+        """
+        self.window_size = window_size
+        self.errors = deque()
+        self.features = deque()
+        self.sum_sq_error = 0.0
+        self.sum_abs_error = 0.0
+        self.sum_features = np.zeros(n_features)
+
+    def push_error(self, error):
+        """Menambahkan satu error prediksi dan membuang yang tertua jika jendela penuh."""
+        self.errors.append(error)
+        self.sum_sq_error += error * error
+        self.sum_abs_error += abs(error)
+        if len(self.errors) > self.window_size:
+            oldest = self.errors.popleft()
+            self.sum_sq_error -= oldest * oldest
+            self.sum_abs_error -= abs(oldest)
+
+    def push_features(self, feature_vector):
+        """Menambahkan satu vektor fitur dan membuang yang tertua jika jendela penuh."""
+        self.features.append(feature_vector)
+        self.sum_features += feature_vector
+        if len(self.features) > self.window_size:
+            self.sum_features -= self.features.popleft()
+
+    def mse(self):
+        return max(self.sum_sq_error, 0.0) / len(self.errors) if self.errors else None
+
+    def mae(self):
+        return max(self.sum_abs_error, 0.0) / len(self.errors) if self.errors else None
+
+    def feature_means(self):
+        return self.sum_features / len(self.features) if self.features else None
+
+
+class PredictionMonitor:
+    def __init__(self, feature_names, target_col_label, log_dir,
+                 reference_feature_stats=None, reference_mse=None,
+                 window_size=30, min_samples=10, mse_ratio_threshold=2.0,
+                 drift_threshold=3.0, retrain_cooldown_seconds=3600, retrain_fn=None,
+                 exchange_holidays=None):
+        """
+        Inisialisasi (constructor) untuk monitor akurasi dan drift prediksi yang dilayani.
+        Setiap prediksi dicatat ke log biner append-only bersama tanggal bar-nya. Submit terakhir
+        untuk suatu tanggal dianggap sebagai bar sebenarnya hari itu, dan baru difinalkan saat
+        tanggal yang lebih baru masuk. Harga penutupan bar final tersebut lalu digabung sebagai
+        nilai aktual untuk prediksi dari hari bursa sebelumnya. MSE/MAE bergulir dan drift fitur
+        diperbarui secara inkremental, dan retrain dipicu jika ambang batas terlampaui.
+        Status yang belum selesai (bar terbuka, prediksi yang menunggu aktual, jendela bergulir)
+        dipulihkan dari ekor log saat monitor dibuat, sehingga restart aplikasi tidak memutus join.
+
+        Args:
+            feature_names (list): Nama fitur sesuai urutan input model.
+            target_col_label (str): Nama kolom target (harga penutupan) di dalam fitur bar.
+            log_dir (str): Direktori untuk menyimpan file log prediksi per ticker.
+            reference_feature_stats (dict, optional): {'mean': [...], 'std': [...]} dari data training.
+            reference_mse (float, optional): MSE data uji saat training sebagai acuan.
+            window_size (int, optional): Ukuran jendela bergulir. Defaults to 30.
+            min_samples (int, optional): Sampel minimum sebelum ambang diperiksa. Defaults to 10.
+            mse_ratio_threshold (float, optional): Rasio MSE bergulir terhadap MSE acuan. Defaults to 2.0.
+            drift_threshold (float, optional): Pergeseran rata-rata fitur dalam satuan std. Defaults to 3.0.
+            retrain_cooldown_seconds (float, optional): Jeda minimum antar retrain. Defaults to 3600.
+            retrain_fn (callable, optional): Fungsi `retrain_fn(ticker)` yang dipanggil saat retrain dipicu.
+            exchange_holidays (list, optional): Tanggal libur bursa (YYYY-MM-DD) di luar akhir pekan.
+        """
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.target_index = self.feature_names.index(target_col_label) if target_col_label in self.feature_names else None
+        self.log_dir = log_dir
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.mse_ratio_threshold = mse_ratio_threshold
+        self.drift_threshold = drift_threshold
+        self.retrain_cooldown_seconds = retrain_cooldown_seconds
+        self.retrain_fn = retrain_fn
+        self.exchange_holidays = list(exchange_holidays) if exchange_holidays else []
+
+        self._record = _record_struct(self.n_features)
+        self._lock = threading.Lock()
+        self._windows = {}          # ticker -> _RollingWindow
+        self._open_bars = {}        # ticker -> (tanggal, prediksi, vektor fitur) submit terakhir yang masih bisa diganti
+        self._awaiting = {}         # ticker -> (tanggal, prediksi, vektor fitur) bar final yang menunggu aktual
+        self._log_files = {}        # ticker -> file handle log yang terbuka dalam mode append
+        self._last_retrain = {}     # ticker -> waktu retrain terakhir
+        self._retraining = set()    # ticker yang sedang di-retrain
+        self._join_counts = {}      # ticker -> jumlah total prediksi yang sudah digabung dengan aktual
+        self._stale_retrain = {}    # ticker -> jumlah join saat retrain terakhir tidak mengubah acuan
+
+        self._reference_key = None
+        self._reference_version = 0
+        self.set_reference(reference_feature_stats, reference_mse)
+        self._restore_from_logs()
+        print(f"[log] PredictionMonitor diinisialisasi (window={window_size}, log di {log_dir}).")
+
+    def set_reference(self, reference_feature_stats, reference_mse):
+        """
+        Menetapkan statistik acuan dari training. Dipanggil ulang setelah model di-retrain.
+
+        Args:
+            reference_feature_stats (dict): {'mean': [...], 'std': [...]} atau None.
+            reference_mse (float): MSE data uji saat training atau None.
+        """
+        if reference_feature_stats:
+            reference_mean = np.asarray(reference_feature_stats['mean'], dtype=float)
+            raw_std = np.asarray(reference_feature_stats['std'], dtype=float)
+            reference_key = (reference_mse, tuple(reference_mean.tolist()), tuple(raw_std.tolist()))
+            # Fitur dengan std nol tidak bisa dinormalisasi, jadi diabaikan dalam perhitungan drift
+            reference_std = np.where(raw_std > 0, raw_std, np.nan)
+        else:
+            reference_mean, reference_std = None, None
+            reference_key = (reference_mse, None, None)
+            print("[Peringatan Monitor] Statistik fitur acuan tidak tersedia. Deteksi drift dinonaktifkan.")
+
+        with self._lock:
+            self.reference_mse = reference_mse
+            self.reference_mean, self.reference_std = reference_mean, reference_std
+            # Versi hanya naik jika acuan benar-benar berubah, untuk mendeteksi retrain yang tidak berdampak
+            if reference_key != self._reference_key:
+                self._reference_key = reference_key
+                self._reference_version += 1
+
+    def record_prediction(self, feature_values, predicted_value, bar_date, ticker):
+        """
+        Mencatat bar yang masuk beserta prediksinya ke log. Submit ulang untuk tanggal yang sama
+        (misal kueri what-if atau koreksi salah ketik) menggantikan bar terbuka hari itu. Saat
+        tanggal yang lebih baru masuk, bar terbuka difinalkan: harga penutupannya digabung sebagai
+        aktual untuk bar final sebelumnya jika keduanya hari bursa berurutan. Tanggal yang lebih
+        lama dari bar terbuka hanya dicatat ke log.
+
+        Args:
+            feature_values (list): Nilai fitur sesuai urutan `feature_names`.
+            predicted_value (float): Harga penutupan H+1 yang diprediksi.
+            bar_date (datetime.date): Tanggal bar yang menjadi input prediksi.
+            ticker (str): Kode saham yang diprediksi.
+
+        Returns:
+            float: Error prediksi yang baru digabung (prediksi - aktual), atau None jika tidak ada.
+        """
+        feature_vector = np.asarray(feature_values, dtype=float)
+        with self._lock:
+            self._append_record(ticker, RECORD_KIND_PREDICTION, bar_date, predicted_value, float('nan'), feature_vector)
+            error = self._advance_bar(ticker, bar_date, float(predicted_value), feature_vector, apply_join=True)
+            retrain_reason = self._thresholds_crossed(ticker) if error is not None else None
+        if retrain_reason:
+            self._trigger_retrain(ticker, retrain_reason)
+        return error
+
+    def get_summary(self, ticker):
+        """
+        Mengembalikan ringkasan statistik monitoring terkini untuk satu ticker.
+
+        Args:
+            ticker (str): Kode saham.
+
+        Returns:
+            dict: Berisi jumlah sampel, MSE/MAE bergulir, dan skor drift per fitur.
+        """
+        with self._lock:
+            window = self._get_window(ticker)
+            drift_scores = self._drift_scores(window)
+            return {
+                'ticker': ticker,
+                'n_samples': len(window.errors),
+                'rolling_mse': window.mse(),
+                'rolling_mae': window.mae(),
+                'reference_mse': self.reference_mse,
+                'feature_drift': None if drift_scores is None else dict(zip(self.feature_names, drift_scores.tolist())),
+            }
+
+    def get_joined_training_rows(self, ticker):
+        """
+        Mengambil pasangan (fitur bar H, harga penutupan aktual H+1) dari log untuk dipakai
+        sebagai data training tambahan. Jika satu tanggal digabung lebih dari sekali,
+        record terakhir yang dipakai.
+
+        Args:
+            ticker (str): Kode saham.
+
+        Returns:
+            tuple: (daftar tanggal bar, array fitur, array target), urut berdasarkan tanggal.
+        """
+        log_path = self.get_log_path(ticker)
+        with self._lock:
+            if ticker in self._log_files:
+                self._log_files[ticker].flush()
+        if not os.path.exists(log_path):
+            return [], np.empty((0, self.n_features)), np.empty(0)
+        # Log bersifat append-only dan read_log membuang record terakhir yang terpotong,
+        # jadi pembacaan tidak perlu memegang lock yang dipakai jalur serving
+        records = self.read_log(log_path, self.n_features)
+
+        joined_by_date = {rec['bar_date']: rec for rec in records if rec['kind'] == RECORD_KIND_JOINED.decode()}
+        bar_dates = sorted(joined_by_date)
+        X_joined = np.array([joined_by_date[d]['features'] for d in bar_dates], dtype=float).reshape(-1, self.n_features)
+        y_joined = np.array([joined_by_date[d]['actual'] for d in bar_dates], dtype=float)
+        return bar_dates, X_joined, y_joined
+
+    def reset(self, ticker):
+        """Mengosongkan jendela bergulir milik ticker (misal setelah retrain). Bar terbuka dan yang menunggu aktual tetap disimpan."""
+        with self._lock:
+            self._windows.pop(ticker, None)
+
+    def close(self):
+        """Menutup semua file log yang masih terbuka."""
+        with self._lock:
+            for log_file in self._log_files.values():
+                log_file.close()
+            self._log_files.clear()
+
+    def get_log_path(self, ticker):
+        return os.path.join(self.log_dir, f"{ticker}_predictions.bin")
+
+    @staticmethod
+    def read_log(log_path, n_features, max_records=None):
+        """
+        Membaca isi log biner untuk analisis offline atau pemulihan status.
+
+        Args:
+            log_path (str): Path ke file log prediksi.
+            n_features (int): Jumlah fitur per record.
+            max_records (int, optional): Hanya baca sejumlah record terakhir. Defaults to None (semua).
+
+        Returns:
+            list: Daftar dict berisi jenis record, timestamp, tanggal bar, prediksi, aktual, dan fitur.
+        """
+        record = _record_struct(n_features)
+        # Mengabaikan sisa byte dari record terakhir yang mungkin terpotong saat proses berhenti
+        n_complete_records = os.path.getsize(log_path) // record.size
+        first_record = 0 if max_records is None else max(0, n_complete_records - max_records)
+        with open(log_path, 'rb') as log_file:
+            log_file.seek(first_record * record.size)
+            raw_bytes = log_file.read((n_complete_records - first_record) * record.size)
+        usable_length = len(raw_bytes) - len(raw_bytes) % record.size
+        return [
+            {
+                'kind': values[0].decode(),
+                'timestamp': values[1],
+                'bar_date': datetime.date.fromordinal(values[2]),
+                'predicted': values[3],
+                'actual': values[4],
+                'features': list(values[5:]),
+            }
+            for values in record.iter_unpack(raw_bytes[:usable_length])
+        ]
+
+    def _get_window(self, ticker):
+        if ticker not in self._windows:
+            self._windows[ticker] = _RollingWindow(self.window_size, self.n_features)
+        return self._windows[ticker]
+
+    def _advance_bar(self, ticker, bar_date, predicted_value, feature_vector, apply_join):
+        """
+        Memperbarui bar terbuka dan bar yang menunggu aktual. Harus dipanggil saat `self._lock`
+        dipegang. Dengan `apply_join=False` hanya status yang diperbarui (dipakai saat pemulihan
+        dari log, karena join yang sudah terjadi sudah tercatat sebagai record J).
+
+        Returns:
+            float: Error prediksi jika terjadi join, atau None.
+        """
+        open_bar = self._open_bars.get(ticker)
+        if open_bar is not None and bar_date < open_bar[0]:
+            return None
+        if open_bar is not None and bar_date == open_bar[0]:
+            self._open_bars[ticker] = (bar_date, predicted_value, feature_vector)
+            return None
+
+        error = None
+        if open_bar is not None:
+            # Tanggal baru masuk, jadi submit terakhir pada bar terbuka menjadi bar final hari itu
+            awaiting = self._awaiting.get(ticker)
+            if (apply_join and awaiting is not None and self.target_index is not None
+                    and is_next_trading_day(awaiting[0], open_bar[0], self.exchange_holidays)):
+                error = self._join(ticker, awaiting, open_bar[2][self.target_index])
+            self._awaiting[ticker] = open_bar
+        self._open_bars[ticker] = (bar_date, predicted_value, feature_vector)
+        return error
+
+    def _join(self, ticker, awaiting, actual_value):
+        """Mencatat record J dan memperbarui jendela bergulir. Harus dipanggil saat `self._lock` dipegang."""
+        bar_date, predicted_value, feature_vector = awaiting
+        error = predicted_value - float(actual_value)
+        self._append_record(ticker, RECORD_KIND_JOINED, bar_date, predicted_value, float(actual_value), feature_vector)
+        window = self._get_window(ticker)
+        window.push_error(error)
+        window.push_features(feature_vector)
+        self._join_counts[ticker] = self._join_counts.get(ticker, 0) + 1
+        return error
+
+    def _restore_from_logs(self):
+        """
+        Memulihkan bar terbuka, bar yang menunggu aktual, dan jendela bergulir setiap ticker
+        dari ekor log yang sudah ada, agar join tetap berjalan setelah aplikasi di-restart.
+        """
+        if not os.path.isdir(self.log_dir):
+            return
+        log_suffix = '_predictions.bin'
+        for file_name in sorted(os.listdir(self.log_dir)):
+            if not file_name.endswith(log_suffix):
+                continue
+            ticker = file_name[:-len(log_suffix)]
+            records = self.read_log(os.path.join(self.log_dir, file_name), self.n_features,
+                                    max_records=RESTORE_TAIL_FACTOR * self.window_size)
+            joined_records = [rec for rec in records if rec['kind'] == RECORD_KIND_JOINED.decode()]
+            with self._lock:
+                for rec in records:
+                    if rec['kind'] == RECORD_KIND_PREDICTION.decode():
+                        self._advance_bar(ticker, rec['bar_date'], rec['predicted'],
+                                          np.asarray(rec['features'], dtype=float), apply_join=False)
+                window = self._get_window(ticker)
+                for rec in joined_records[-self.window_size:]:
+                    window.push_error(rec['predicted'] - rec['actual'])
+                    window.push_features(np.asarray(rec['features'], dtype=float))
+            if records:
+                print(f"[log] Status monitoring '{ticker}' dipulihkan dari log ({len(joined_records)} join di ekor log).")
+
+    def _append_record(self, ticker, kind, bar_date, predicted_value, actual_value, feature_vector):
+        log_file = self._log_files.get(ticker)
+        if log_file is None:
+            log_file = open(self.get_log_path(ticker), 'ab')
+            self._log_files[ticker] = log_file
+        log_file.write(self._record.pack(kind, time.time(), bar_date.toordinal(),
+                                         float(predicted_value), float(actual_value), *feature_vector))
+        log_file.flush()
+
+    def _drift_scores(self, window):
+        """Menghitung pergeseran rata-rata bergulir tiap fitur dalam satuan std data training."""
+        window_means = window.feature_means()
+        if self.reference_mean is None or window_means is None:
+            return None
+        return np.abs(window_means - self.reference_mean) / self.reference_std
+
+    def _thresholds_crossed(self, ticker):
+        """
+        Memeriksa ambang MSE dan drift. Harus dipanggil saat `self._lock` dipegang.
+
+        Returns:
+            str: Alasan retrain jika ambang terlampaui, atau None.
+        """
+        window = self._get_window(ticker)
+
+        if self.reference_mse and len(window.errors) >= self.min_samples:
+            rolling_mse = window.mse()
+            if rolling_mse > self.mse_ratio_threshold * self.reference_mse:
+                return (f"MSE bergulir ({rolling_mse:.4f}) melebihi "
+                        f"{self.mse_ratio_threshold}x MSE acuan ({self.reference_mse:.4f})")
+
+        if len(window.features) >= self.min_samples:
+            drift_scores = self._drift_scores(window)
+            if drift_scores is not None and np.nanmax(drift_scores, initial=0.0) > self.drift_threshold:
+                drifted = [name for name, score in zip(self.feature_names, drift_scores) if score > self.drift_threshold]
+                return f"drift fitur terdeteksi pada {drifted}"
+        return None
+
+    def _trigger_retrain(self, ticker, reason):
+        """
+        Menjalankan retrain untuk ticker di thread terpisah agar tidak memblokir serving.
+        Retrain dilewati jika sedang berjalan, masih dalam masa cooldown, atau retrain terakhir
+        tidak mengubah statistik acuan dan belum ada `window_size` sampel baru sejak itu.
+        """
+        if self.retrain_fn is None:
+            return
+        with self._lock:
+            if ticker in self._retraining:
+                return
+            last_retrain = self._last_retrain.get(ticker)
+            if last_retrain is not None and time.time() - last_retrain < self.retrain_cooldown_seconds:
+                return
+            stale_join_count = self._stale_retrain.get(ticker)
+            join_count = self._join_counts.get(ticker, 0)
+            if stale_join_count is not None and join_count - stale_join_count < self.window_size:
+                return
+            self._retraining.add(ticker)
+            self._last_retrain[ticker] = time.time()
+            version_before = self._reference_version
+
+        def _run():
+            print(f"[Peringatan Monitor] Memulai retrain untuk ticker '{ticker}': {reason}.")
+            try:
+                self.retrain_fn(ticker)
+                with self._lock:
+                    if self._reference_version == version_before:
+                        self._stale_retrain[ticker] = self._join_counts.get(ticker, 0)
+                        print(f"[Peringatan Monitor] Retrain '{ticker}' tidak mengubah statistik acuan. "
+                              f"Retrain berikutnya menunggu {self.window_size} sampel baru.")
+                    else:
+                        self._stale_retrain.pop(ticker, None)
+                # Statistik lama berasal dari model sebelumnya, jadi jendela dikosongkan
+                self.reset(ticker)
+                print(f"[log] Retrain untuk ticker '{ticker}' selesai.")
+            except Exception as e:
+                print(f"[Error Monitor] Retrain untuk ticker '{ticker}' gagal: {e}")
+            finally:
+                with self._lock:
+                    self._retraining.discard(ticker)
+
+        threading.Thread(target=_run, daemon=True).start()
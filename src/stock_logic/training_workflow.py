@@ -3,7 +3,7 @@ from .model_operations import ModelOperations
 from .performance_eval import PerformanceEvaluator
 
 class TrainingWorkflow:
-    def __init__(self, app_settings):
+    def __init__(self, app_settings, model_save_path=None):
         """
         Inisialisasi (constructor) untuk kelas TrainingWorkflow.
         Menyiapkan semua komponen yang diperlukan untuk alur kerja, yaitu:
@@ -12,8 +12,10 @@ class TrainingWorkflow:
 
         Args:
             app_settings (module): Modul 'config' yang berisi semua pengaturan aplikasi.
+            model_save_path (str, optional): Path penyimpanan model. Defaults to MODEL_SAVE_PATH di config.
         """
         self.settings = app_settings
+        self.model_save_path = model_save_path or self.settings.MODEL_SAVE_PATH
         # Inisialisasi objek untuk setiap langkah dalam workflow
         self.data_proc = DataProcessor(
             csv_path=self.settings.CSV_FILE_PATH,
@@ -29,17 +31,25 @@ class TrainingWorkflow:
         self.perf_eval = PerformanceEvaluator()
         print("[log] TrainingWorkflow diinisialisasi.")
 
-    def execute(self):
+    def execute(self, extra_training_rows=None, create_plot=True):
         """
         Menjalankan keseluruhan alur kerja (workflow) training secara berurutan.
         Mulai dari memuat data, memproses, melatih model, mengevaluasi,
         hingga menyimpan model yang sudah jadi.
+
+        Args:
+            extra_training_rows (tuple, optional): (tanggal bar, X, y) tambahan di luar dataset CSV,
+                                                   misal hasil join dari PredictionMonitor.
+            create_plot (bool, optional): Buat plot hasil evaluasi. Dimatikan saat retrain dari
+                                          thread latar belakang karena pyplot tidak thread-safe.
         """
         print("\n[Workflow] Memulai alur kerja training...")
         
         # Langkah 1: Memuat dan memproses data
         self.data_proc.load_dataset()
         self.data_proc.prepare_for_training()
+        if extra_training_rows is not None:
+            self.data_proc.append_training_rows(*extra_training_rows)
         self.data_proc.split_time_series_data()
         
         # Pemeriksaan untuk memastikan data training tidak kosong setelah diproses
@@ -51,23 +61,30 @@ class TrainingWorkflow:
         self.model_ops.perform_training(self.data_proc.X_train, self.data_proc.y_train)
         
         # Langkah 3: Evaluasi model pada data tes (jika ada)
+        test_mse = None
         if self.data_proc.X_test is not None and len(self.data_proc.X_test) > 0:
             predictions_on_test = self.model_ops.generate_predictions(self.data_proc.X_test)
-            # Hitung skor MSE
-            self.perf_eval.get_mse_score(self.data_proc.y_test, predictions_on_test)
+            # Hitung skor MSE (disimpan sebagai acuan untuk monitoring saat serving)
+            test_mse = float(self.perf_eval.get_mse_score(self.data_proc.y_test, predictions_on_test))
             # Buat dan simpan plot hasil
-            self.perf_eval.create_results_plot(
-                self.data_proc.y_test, 
-                predictions_on_test, 
-                self.settings.PLOT_SAVE_PATH
-            )
+            if create_plot:
+                self.perf_eval.create_results_plot(
+                    self.data_proc.y_test, 
+                    predictions_on_test, 
+                    self.settings.PLOT_SAVE_PATH
+                )
         else:
             print("[Peringatan Workflow] Tidak ada data tes untuk evaluasi atau pembuatan plot.")
             
-        # Langkah 4: Menyimpan model yang telah dilatih
+        # Langkah 4: Menyimpan model yang telah dilatih beserta statistik acuan untuk monitoring
         self.model_ops.save_trained_model(
-            output_path=self.settings.MODEL_SAVE_PATH,
+            output_path=self.model_save_path,
             training_feature_cols=self.settings.FEATURE_COLUMN_NAMES, 
-            training_target_col=self.settings.TARGET_COLUMN_NAME
+            training_target_col=self.settings.TARGET_COLUMN_NAME,
+            reference_feature_stats={
+                'mean': self.data_proc.X_train.mean(axis=0).tolist(),
+                'std': self.data_proc.X_train.std(axis=0).tolist()
+            },
+            reference_mse=test_mse
         )
         print("[Workflow] Alur kerja training selesai.\n")
\ No newline at end of file
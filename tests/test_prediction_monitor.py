@@ -0,0 +1,225 @@
+import datetime
+import importlib.util
+import os
+import threading
+
+import numpy as np
+import pytest
+
+# Modul dimuat langsung dari file agar tes tidak membutuhkan gradio/xgboost
+# yang diimpor oleh __init__.py paket stock_logic.
+_MODULE_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'stock_logic', 'prediction_monitor.py')
+_spec = importlib.util.spec_from_file_location('prediction_monitor', _MODULE_PATH)
+prediction_monitor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(prediction_monitor)
+
+FEATURES = ['Open Price', 'Close Price']
+REFERENCE_STATS = {'mean': [100.0, 100.0], 'std': [1.0, 1.0]}
+MONDAY = datetime.date(2024, 1, 1)
+
+
+def make_monitor(tmp_path, **kwargs):
+    params = dict(
+        feature_names=FEATURES, target_col_label='Close Price', log_dir=str(tmp_path),
+        reference_feature_stats=REFERENCE_STATS, reference_mse=1.0,
+        window_size=3, min_samples=2, retrain_cooldown_seconds=3600,
+    )
+    params.update(kwargs)
+    return prediction_monitor.PredictionMonitor(**params)
+
+
+def test_rolling_window_evicts_oldest_and_keeps_sums():
+    window = prediction_monitor._RollingWindow(window_size=2, n_features=2)
+    for error, features in [(1.0, [1.0, 2.0]), (-2.0, [3.0, 4.0]), (3.0, [5.0, 6.0])]:
+        window.push_error(error)
+        window.push_features(np.array(features))
+
+    assert list(window.errors) == [-2.0, 3.0]
+    assert window.mse() == pytest.approx((4.0 + 9.0) / 2)
+    assert window.mae() == pytest.approx((2.0 + 3.0) / 2)
+    np.testing.assert_allclose(window.feature_means(), [4.0, 5.0])
+
+
+def test_rolling_window_empty_returns_none():
+    window = prediction_monitor._RollingWindow(window_size=2, n_features=2)
+    assert window.mse() is None and window.mae() is None and window.feature_means() is None
+
+
+def submit(monitor, bar_date, close, predicted, ticker='X'):
+    return monitor.record_prediction([100.0, close], predicted, bar_date, ticker)
+
+
+def days_after(start, n_days):
+    return start + datetime.timedelta(days=n_days)
+
+
+def test_read_log_round_trip_and_ignores_truncated_tail(tmp_path):
+    monitor = make_monitor(tmp_path)
+    submit(monitor, MONDAY, 100.0, 101.0)
+    submit(monitor, days_after(MONDAY, 1), 102.0, 103.0)
+    submit(monitor, days_after(MONDAY, 2), 104.0, 105.0)
+    monitor.close()
+
+    log_path = monitor.get_log_path('X')
+    with open(log_path, 'ab') as log_file:
+        log_file.write(b'\x00' * 7)
+
+    records = prediction_monitor.PredictionMonitor.read_log(log_path, len(FEATURES))
+    assert [rec['kind'] for rec in records] == ['P', 'P', 'P', 'J']
+    assert records[0]['bar_date'] == MONDAY and np.isnan(records[0]['actual'])
+    assert records[3]['bar_date'] == MONDAY
+    assert records[3]['predicted'] == 101.0 and records[3]['actual'] == 102.0
+    assert records[3]['features'] == [100.0, 100.0]
+
+    tail = prediction_monitor.PredictionMonitor.read_log(log_path, len(FEATURES), max_records=2)
+    assert [rec['kind'] for rec in tail] == ['P', 'J']
+    assert tail[0]['bar_date'] == days_after(MONDAY, 2)
+
+
+def test_join_uses_latest_submission_per_date(tmp_path):
+    monitor = make_monitor(tmp_path)
+    friday, next_monday = datetime.date(2024, 1, 5), datetime.date(2024, 1, 8)
+    # Kueri what-if/salah ketik diganti oleh submit terakhir untuk tanggal yang sama
+    assert submit(monitor, friday, 999.0, 90.0) is None
+    assert submit(monitor, friday, 100.0, 101.0) is None
+    assert submit(monitor, next_monday, 500.0, 480.0) is None
+    assert submit(monitor, next_monday, 103.0, 104.0) is None
+    assert monitor.get_summary('X')['n_samples'] == 0
+
+    # Bar Senin baru final saat tanggal berikutnya masuk
+    assert submit(monitor, days_after(next_monday, 1), 105.0, 106.0) == pytest.approx(101.0 - 103.0)
+    summary = monitor.get_summary('X')
+    assert summary['n_samples'] == 1
+    assert summary['feature_drift']['Close Price'] == pytest.approx(0.0)
+    monitor.close()
+
+
+def test_older_date_is_only_logged(tmp_path):
+    monitor = make_monitor(tmp_path)
+    submit(monitor, days_after(MONDAY, 1), 101.0, 102.0)
+    assert submit(monitor, MONDAY, 100.0, 101.0) is None
+    assert submit(monitor, days_after(MONDAY, 2), 102.0, 103.0) is None
+    assert monitor.get_summary('X')['n_samples'] == 0
+    monitor.close()
+
+
+def test_join_skips_when_a_trading_day_is_missing(tmp_path):
+    monitor = make_monitor(tmp_path)
+    submit(monitor, MONDAY, 100.0, 101.0)
+    submit(monitor, days_after(MONDAY, 2), 150.0, 151.0)
+    assert submit(monitor, days_after(MONDAY, 3), 152.0, 153.0) is None
+    assert monitor.get_summary('X')['n_samples'] == 0
+    monitor.close()
+
+
+def test_join_across_exchange_holiday(tmp_path):
+    tuesday = days_after(MONDAY, 1)
+    monitor = make_monitor(tmp_path, exchange_holidays=[tuesday.isoformat()])
+    submit(monitor, MONDAY, 100.0, 101.0)
+    submit(monitor, days_after(MONDAY, 2), 102.0, 103.0)
+    assert submit(monitor, days_after(MONDAY, 3), 104.0, 105.0) == pytest.approx(101.0 - 102.0)
+    monitor.close()
+
+
+def test_is_next_trading_day_skips_weekend_and_holidays():
+    friday, next_monday = datetime.date(2024, 1, 5), datetime.date(2024, 1, 8)
+    assert prediction_monitor.is_next_trading_day(friday, next_monday)
+    assert not prediction_monitor.is_next_trading_day(friday, days_after(next_monday, 1))
+    assert prediction_monitor.is_next_trading_day(friday, days_after(next_monday, 1), holidays=['2024-01-08'])
+
+
+def test_join_survives_restart(tmp_path):
+    monitor = make_monitor(tmp_path)
+    submit(monitor, MONDAY, 100.0, 101.0)
+    submit(monitor, days_after(MONDAY, 1), 102.0, 103.0)
+    monitor.close()
+
+    restarted = make_monitor(tmp_path)
+    assert submit(restarted, days_after(MONDAY, 2), 104.0, 105.0) == pytest.approx(101.0 - 102.0)
+    restarted.close()
+
+    # Jendela bergulir juga dipulihkan dari record J di log
+    restarted_again = make_monitor(tmp_path)
+    summary = restarted_again.get_summary('X')
+    assert summary['n_samples'] == 1 and summary['rolling_mae'] == pytest.approx(1.0)
+    assert submit(restarted_again, days_after(MONDAY, 3), 106.0, 107.0) == pytest.approx(103.0 - 104.0)
+    assert restarted_again.get_summary('X')['n_samples'] == 2
+    restarted_again.close()
+
+
+def test_open_bar_survives_restart(tmp_path):
+    monitor = make_monitor(tmp_path)
+    submit(monitor, MONDAY, 100.0, 101.0)
+    monitor.close()
+
+    restarted = make_monitor(tmp_path)
+    submit(restarted, days_after(MONDAY, 1), 102.0, 103.0)
+    assert submit(restarted, days_after(MONDAY, 2), 104.0, 105.0) == pytest.approx(101.0 - 102.0)
+    assert restarted.get_summary('X')['n_samples'] == 1
+    restarted.close()
+
+
+def test_joined_training_rows_come_from_log(tmp_path):
+    monitor = make_monitor(tmp_path)
+    for offset, close in enumerate([100.0, 101.0, 102.0, 103.0]):
+        submit(monitor, days_after(MONDAY, offset), close, close)
+
+    row_dates, X_joined, y_joined = monitor.get_joined_training_rows('X')
+    assert row_dates == [MONDAY, days_after(MONDAY, 1)]
+    np.testing.assert_allclose(X_joined, [[100.0, 100.0], [100.0, 101.0]])
+    np.testing.assert_allclose(y_joined, [101.0, 102.0])
+    monitor.close()
+
+
+def _feed_bad_predictions(monitor, n_days, start=MONDAY):
+    bar_date = start
+    for _ in range(n_days):
+        submit(monitor, bar_date, 100.0, 150.0)
+        bar_date = bar_date + datetime.timedelta(days=1)
+        while bar_date.weekday() >= 5:
+            bar_date = bar_date + datetime.timedelta(days=1)
+    return bar_date
+
+
+def _wait_for_retrain_threads():
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and thread.daemon:
+            thread.join(timeout=5)
+
+
+def test_retrain_respects_cooldown(tmp_path):
+    retrain_calls = []
+
+    def retrain_fn(ticker):
+        retrain_calls.append(ticker)
+        monitor.set_reference({'mean': [100.0, 100.0], 'std': [2.0, 2.0]}, 2.0)
+
+    monitor = make_monitor(tmp_path, retrain_fn=retrain_fn)
+    next_date = _feed_bad_predictions(monitor, 4)
+    _wait_for_retrain_threads()
+    assert retrain_calls == ['X']
+
+    # Ambang masih terlampaui dan acuan berubah, tapi masih dalam masa cooldown
+    _feed_bad_predictions(monitor, 5, start=next_date)
+    _wait_for_retrain_threads()
+    assert retrain_calls == ['X']
+    monitor.close()
+
+
+def test_retrain_without_reference_change_is_suppressed(tmp_path):
+    retrain_calls = []
+    monitor = make_monitor(tmp_path, retrain_cooldown_seconds=0, retrain_fn=retrain_calls.append)
+
+    next_date = _feed_bad_predictions(monitor, 4)
+    _wait_for_retrain_threads()
+    assert retrain_calls == ['X']
+
+    # Retrain pertama tidak mengubah acuan, jadi retrain berikutnya menunggu window_size sampel baru
+    next_date = _feed_bad_predictions(monitor, 2, start=next_date)
+    _wait_for_retrain_threads()
+    assert retrain_calls == ['X']
+
+    _feed_bad_predictions(monitor, 1, start=next_date)
+    _wait_for_retrain_threads()
+    assert retrain_calls == ['X', 'X']
+    monitor.close()